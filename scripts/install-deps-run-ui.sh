@@ -109,7 +109,7 @@ start_ui() {
   echo "[INFO] Starting Flask UI on 0.0.0.0:${PORT} (logs: ${LOG_FILE})"
   (
     cd "${UI_DIR}"
-    FLASK_APP=app.py "${VENV_DIR}/bin/flask" run --host 0.0.0.0 --port "${PORT}" >"${LOG_FILE}" 2>&1 &
+    PORT="${PORT}" "${VENV_DIR}/bin/python" app.py >"${LOG_FILE}" 2>&1 &
     echo $! > "${PID_FILE}"
   )
 }
@@ -1,8 +1,110 @@
 import dataclasses
+import hashlib
 import json
-from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    json_dumpb = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:  # fall back to the standard library
+    orjson = None
+
+    def json_dumpb(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+try:
+    import ijson
+
+    if ijson.backend != "yajl2_c":  # the pure-Python backends are slower than a full orjson decode
+        ijson = None
+except ImportError:  # optional; whole responses are decoded instead
+    ijson = None
+
+try:
+    import h2  # noqa: F401  # httpx needs it for http2=True
+    import httpx
+except ImportError:  # optional; requests over HTTP/1.1 is used instead
+    httpx = None
+
+HTTP_ERRORS: Tuple[type, ...] = (requests.HTTPError,) + ((httpx.HTTPStatusError,) if httpx else ())
+
+logger = logging.getLogger(__name__)
+
+# Asked for explicitly: some Prism deployments only compress when the client negotiates it.
+DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Retried on idempotent-in-practice list POSTs; Prism returns 429/5xx under load.
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["POST", "GET"]),
+    raise_on_status=False,  # hand the last response to raise_for_status() as before
+)
+
+LIST_PAGE_SIZE = 500
+INVENTORY_TTL_SECONDS = 60.0
+INVENTORY_CACHE_SIZE = 32
+CLIENT_CACHE_SIZE = 16
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Entity paths each transform reads; with ijson everything else is skipped while parsing.
+CLUSTER_FIELDS = ("metadata.name", "metadata.uuid", "status.resources.nodes", "status.resources.network")
+SUBNET_FIELDS = (
+    "metadata.name",
+    "metadata.uuid",
+    "status.resources.vlan_id",
+    "status.resources.subnet_type",
+    "status.resources.ip_config",
+)
+CONTAINER_FIELDS = (
+    "metadata.name",
+    "metadata.uuid",
+    "status.resources.replication_factor",
+    "status.resources.max_capacity",
+)
+PROJECT_FIELDS = ("metadata.name", "metadata.uuid")
+
+# groups-API attribute behind each record field; "name" lands in metadata, the rest in status.resources.
+# Nested values (cluster nodes/network, subnet ip_config) cannot be projected and come back empty.
+GROUP_ATTRIBUTES: Dict[str, Dict[str, str]] = {
+    "cluster": {"name": "name"},
+    "subnet": {"name": "name", "vlan_id": "vlan_id", "subnet_type": "subnet_type"},
+    "storage_container": {
+        "name": "container_name",
+        "replication_factor": "replication_factor",
+        "max_capacity": "max_capacity",
+    },
+    "project": {"name": "name"},
+}
+GROUP_INT_FIELDS = frozenset({"vlan_id", "replication_factor", "max_capacity"})
+
+InventoryKey = Tuple[str, str, str, bool]
+_inventory_cache: Dict[InventoryKey, Tuple[float, Dict[str, Any]]] = {}
+_inventory_lock = threading.Lock()
+
+ClientKey = Tuple[str, str, bool]
+_CLIENTS: Dict[ClientKey, "PrismCentralClient"] = {}
+_CLIENTS_LOCK = threading.Lock()
 
 
 @dataclasses.dataclass
@@ -13,92 +115,429 @@ class PrismCentralCredentials:
     verify_ssl: bool = False
 
 
+# Inventory records. Slotted, so thousands of entities carry no per-instance dict; both
+# Flask JSON providers serialise dataclasses directly.
+@dataclasses.dataclass(slots=True)
+class Cluster:
+    name: str
+    uuid: Optional[str]
+    nodes: List[Any]
+    network: Dict[str, Any]
+
+
+@dataclasses.dataclass(slots=True)
+class Subnet:
+    name: Optional[str]
+    uuid: Optional[str]
+    vlan_id: Optional[int]
+    subnet_type: str
+    ip_config: Dict[str, Any]
+
+
+@dataclasses.dataclass(slots=True)
+class StorageContainer:
+    name: Optional[str]
+    uuid: Optional[str]
+    replication_factor: Optional[int]
+    max_capacity: Optional[int]
+
+
+@dataclasses.dataclass(slots=True)
+class Project:
+    name: Optional[str]
+    uuid: Optional[str]
+
+
+def _entity_sections(entity: Dict[str, Any]) -> Tuple[Mapping[str, Any], Mapping[str, Any]]:
+    """Pull ``metadata`` and ``status.resources`` out of a v3 entity in one pass; null sections read as empty."""
+    status = entity.get("status") or _EMPTY
+    return entity.get("metadata") or _EMPTY, status.get("resources") or _EMPTY
+
+
+def _set_path(target: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    for key in parents:
+        target = target.setdefault(key, {})
+    target[leaf] = value
+
+
+def _parse_list_subset(stream: Any, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Build a v3 list response holding only ``fields`` of each entity plus ``metadata.total_matches``."""
+    entity_prefix = "entities.item"
+    wanted = {f"{entity_prefix}.{path}": path for path in fields}
+    entities: List[Dict[str, Any]] = []
+    total_matches = None
+    entity: Dict[str, Any] = {}
+    builder = None
+    depth = 0
+    target = ""
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            # Inside a wanted object/array: hand every event to the builder until it closes.
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if not depth:
+                    _set_path(entity, target, builder.value)
+                    builder = None
+            continue
+        if prefix == entity_prefix:
+            if event == "start_map":
+                entity = {}
+            elif event == "end_map":
+                entities.append(entity)
+        elif prefix in wanted and event != "map_key":
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+                target = wanted[prefix]
+            else:
+                _set_path(entity, wanted[prefix], value)
+        elif prefix == "metadata.total_matches":
+            total_matches = value
+    metadata = {} if total_matches is None else {"total_matches": total_matches}
+    return {"entities": entities, "metadata": metadata}
+
+
+def _group_entity(result: Dict[str, Any], attributes: Dict[str, str]) -> Dict[str, Any]:
+    """Reshape one groups ``entity_results`` row into the v3 entity layout the transforms read."""
+    values: Dict[str, Any] = {}
+    for column in result.get("data", []):
+        cells = column.get("values") or [{}]
+        cell = cells[0].get("values") or [None]
+        values[column.get("name")] = cell[0]
+    metadata: Dict[str, Any] = {"uuid": result.get("entity_id")}
+    resources: Dict[str, Any] = {}
+    for field_name, attribute in attributes.items():
+        if attribute not in values:
+            continue
+        value = values[attribute]
+        if field_name in GROUP_INT_FIELDS and isinstance(value, str) and value.lstrip("-").isdigit():
+            value = int(value)
+        if field_name == "name":
+            metadata["name"] = value
+        else:
+            resources[field_name] = value
+    return {"metadata": metadata, "status": {"resources": resources}}
+
+
+def _next_offsets(total: Any, returned: int) -> range:
+    """Offsets of the pages after the first one, given the reported total and the first page's size.
+
+    Steps by what the server actually returned rather than the requested length, so a server-side
+    page cap cannot skip rows; a missing or null total means the first page was everything.
+    """
+    if returned <= 0:
+        return range(0)
+    return range(returned, int(total or returned), returned)
+
+
+def _request_body(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Pre-encoded orjson bytes beat requests' own encoder; otherwise let requests encode via json=.
+    return {"data": json_dumpb(payload)} if orjson is not None else {"json": payload}
+
+
 class PrismCentralClient:
     """Minimal Prism Central v3 API helper for discovery operations."""
 
     def __init__(self, credentials: PrismCentralCredentials) -> None:
         self.credentials = credentials
         self.base_url = f"https://{credentials.host}:9440/api/nutanix/v3"
+        # In-flight leases from leased_client(); guarded by _CLIENTS_LOCK.
+        self.leases = 0
+        self.retired = False
+        self.http2 = httpx is not None
+        if self.http2:
+            # One multiplexed HTTP/2 connection carries all concurrent list calls.
+            limits = httpx.Limits(max_keepalive_connections=8, max_connections=8)
+            self.session = httpx.Client(
+                base_url=self.base_url,
+                auth=(credentials.username, credentials.password),
+                headers=DEFAULT_HEADERS,
+                timeout=30,
+                transport=httpx.HTTPTransport(
+                    verify=credentials.verify_ssl, http2=True, limits=limits, retries=RETRY_POLICY.total
+                ),
+            )
+            return
         self.session = requests.Session()
         self.session.auth = (credentials.username, credentials.password)
         self.session.verify = credentials.verify_ssl
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=RETRY_POLICY)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Release the pooled connections held by the underlying session."""
+        self.session.close()
 
-    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _post(self, path: str, payload: Dict[str, Any], fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        if self.http2:
+            response = self.session.post(f"/{path}", content=json_dumpb(payload))
+            response.raise_for_status()
+            logger.debug("POST %s: Content-Encoding=%s", path, response.headers.get("Content-Encoding"))
+            return json_loads(response.content)
         url = f"{self.base_url}/{path}"
-        response = self.session.post(url, data=json.dumps(payload), timeout=30)
+        if fields and ijson is not None:
+            with self.session.post(url, **_request_body(payload), timeout=30, stream=True) as response:
+                response.raise_for_status()
+                logger.debug("POST %s: Content-Encoding=%s", path, response.headers.get("Content-Encoding"))
+                response.raw.decode_content = True
+                return _parse_list_subset(response.raw, fields)
+        response = self.session.post(url, **_request_body(payload), timeout=30)
         response.raise_for_status()
-        return response.json()
+        logger.debug("POST %s: Content-Encoding=%s", path, response.headers.get("Content-Encoding"))
+        return json_loads(response.content)
+
+    def _paginate(
+        self,
+        kind: str,
+        path: str,
+        fields: Optional[Tuple[str, ...]] = None,
+        page: int = LIST_PAGE_SIZE,
+    ) -> List[Dict[str, Any]]:
+        first = self._post(path, {"kind": kind, "offset": 0, "length": page}, fields)
+        entities = list(first.get("entities") or ())
+        offsets = _next_offsets((first.get("metadata") or _EMPTY).get("total_matches"), len(entities))
+        if not offsets:
+            return entities
+        # A pool of its own: borrowing verify()'s workers could deadlock when all four wait on pages.
+        with ThreadPoolExecutor(max_workers=min(len(offsets), 8)) as executor:
+            pages = executor.map(
+                lambda offset: self._post(path, {"kind": kind, "offset": offset, "length": page}, fields), offsets
+            )
+            for data in pages:
+                entities.extend(data.get("entities") or ())
+        return entities
 
     def verify(self) -> Dict[str, Any]:
-        return {
-            "clusters": self.list_clusters(),
-            "subnets": self.list_subnets(),
-            "storage_containers": self.list_storage_containers(),
-            "projects": self.list_projects(),
-        }
-
-    def list_clusters(self) -> List[Dict[str, Any]]:
-        payload = {"kind": "cluster", "offset": 0, "length": 50}
-        data = self._post("clusters/list", payload)
-        return [self._transform_cluster(entity) for entity in data.get("entities", [])]
-
-    def _transform_cluster(self, entity: Dict[str, Any]) -> Dict[str, Any]:
-        metadata = entity.get("metadata", {})
-        status = entity.get("status", {})
-        resources = status.get("resources", {})
-        return {
-            "name": metadata.get("name", "unknown-cluster"),
-            "uuid": metadata.get("uuid"),
-            "nodes": resources.get("nodes", []),
-            "network": resources.get("network", {}),
-        }
-
-    def list_subnets(self) -> List[Dict[str, Any]]:
-        payload = {"kind": "subnet", "offset": 0, "length": 100}
-        data = self._post("subnets/list", payload)
-        return [self._transform_subnet(entity) for entity in data.get("entities", [])]
-
-    def _transform_subnet(self, entity: Dict[str, Any]) -> Dict[str, Any]:
-        metadata = entity.get("metadata", {})
-        status = entity.get("status", {})
-        resources = status.get("resources", {})
-        subnet_type = resources.get("subnet_type", "")
-        return {
-            "name": metadata.get("name"),
-            "uuid": metadata.get("uuid"),
-            "vlan_id": resources.get("vlan_id"),
-            "subnet_type": subnet_type,
-            "ip_config": resources.get("ip_config", {}),
-        }
-
-    def list_storage_containers(self) -> List[Dict[str, Any]]:
-        payload = {"kind": "storage_container", "offset": 0, "length": 50}
-        data = self._post("storage_containers/list", payload)
-        return [self._transform_container(entity) for entity in data.get("entities", [])]
-
-    def _transform_container(self, entity: Dict[str, Any]) -> Dict[str, Any]:
-        metadata = entity.get("metadata", {})
-        status = entity.get("status", {})
-        resources = status.get("resources", {})
-        return {
-            "name": metadata.get("name"),
-            "uuid": metadata.get("uuid"),
-            "replication_factor": resources.get("replication_factor"),
-            "max_capacity": resources.get("max_capacity"),
-        }
-
-    def list_projects(self) -> List[Dict[str, Any]]:
-        payload = {"kind": "project", "offset": 0, "length": 50}
-        data = self._post("projects/list", payload)
-        return [self._transform_project(entity) for entity in data.get("entities", [])]
-
-    def _transform_project(self, entity: Dict[str, Any]) -> Dict[str, Any]:
-        metadata = entity.get("metadata", {})
-        return {
-            "name": metadata.get("name"),
-            "uuid": metadata.get("uuid"),
-        }
+        """Discover clusters, subnets, storage containers and projects for the UI pickers.
+
+        Each kind is read through a groups query projecting only the scalar GROUP_ATTRIBUTES columns,
+        so nested specs (cluster nodes/network, subnet ip_config) come back empty; the list_* methods
+        return them in full. A kind whose groups query is rejected falls back to its v3 list call.
+        """
+        listings = (
+            ("clusters", "cluster", "clusters/list", CLUSTER_FIELDS, self._transform_cluster),
+            ("subnets", "subnet", "subnets/list", SUBNET_FIELDS, self._transform_subnet),
+            ("storage_containers", "storage_container", "storage_containers/list", CONTAINER_FIELDS, self._transform_container),
+            ("projects", "project", "projects/list", PROJECT_FIELDS, self._transform_project),
+        )
+        # The four queries are independent round-trips; overlap them.
+        with ThreadPoolExecutor(max_workers=len(listings)) as executor:
+            futures = {
+                key: (transform, executor.submit(self._groups_or_list, kind, path, fields))
+                for key, kind, path, fields, transform in listings
+            }
+            return {key: [transform(entity) for entity in future.result()] for key, (transform, future) in futures.items()}
+
+    def _groups_paginate(self, entity_type: str, page: int = LIST_PAGE_SIZE) -> List[Dict[str, Any]]:
+        attributes = GROUP_ATTRIBUTES[entity_type]
+        columns = [{"attribute": attribute} for attribute in attributes.values()]
+
+        def fetch(offset: int) -> Dict[str, Any]:
+            payload = {
+                "entity_type": entity_type,
+                "group_member_attributes": columns,
+                "group_member_count": page,
+                "group_member_offset": offset,
+            }
+            return self._post("groups", payload)
+
+        def rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return [
+                _group_entity(result, attributes)
+                for group in data.get("group_results") or ()
+                for result in group.get("entity_results") or ()
+            ]
+
+        first = fetch(0)
+        entities = rows(first)
+        offsets = _next_offsets(first.get("filtered_entity_count"), len(entities))
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(len(offsets), 8)) as executor:
+                for data in executor.map(fetch, offsets):
+                    entities.extend(rows(data))
+        return entities
+
+    def _groups_or_list(self, kind: str, path: str, fields: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        try:
+            return self._groups_paginate(kind)
+        except HTTP_ERRORS as exc:
+            if exc.response is not None and exc.response.status_code == 401:
+                raise
+            return self._paginate(kind, path, fields)
+
+    def list_clusters(self) -> List[Cluster]:
+        return [self._transform_cluster(entity) for entity in self._paginate("cluster", "clusters/list", CLUSTER_FIELDS)]
+
+    @staticmethod
+    def _transform_cluster(entity: Dict[str, Any]) -> Cluster:
+        metadata, resources = _entity_sections(entity)
+        return Cluster(
+            name=metadata.get("name", "unknown-cluster"),
+            uuid=metadata.get("uuid"),
+            nodes=resources.get("nodes") or [],
+            network=resources.get("network") or {},
+        )
+
+    def list_subnets(self) -> List[Subnet]:
+        return [self._transform_subnet(entity) for entity in self._paginate("subnet", "subnets/list", SUBNET_FIELDS)]
+
+    @staticmethod
+    def _transform_subnet(entity: Dict[str, Any]) -> Subnet:
+        metadata, resources = _entity_sections(entity)
+        return Subnet(
+            name=metadata.get("name"),
+            uuid=metadata.get("uuid"),
+            vlan_id=resources.get("vlan_id"),
+            subnet_type=resources.get("subnet_type", ""),
+            ip_config=resources.get("ip_config") or {},
+        )
+
+    def list_storage_containers(self) -> List[StorageContainer]:
+        return [self._transform_container(entity) for entity in self._paginate("storage_container", "storage_containers/list", CONTAINER_FIELDS)]
+
+    @staticmethod
+    def _transform_container(entity: Dict[str, Any]) -> StorageContainer:
+        metadata, resources = _entity_sections(entity)
+        return StorageContainer(
+            name=metadata.get("name"),
+            uuid=metadata.get("uuid"),
+            replication_factor=resources.get("replication_factor"),
+            max_capacity=resources.get("max_capacity"),
+        )
+
+    def list_projects(self) -> List[Project]:
+        # Only name and uuid are kept, so ask groups for just the name column instead of full project specs.
+        return [self._transform_project(entity) for entity in self._groups_or_list("project", "projects/list", PROJECT_FIELDS)]
+
+    @staticmethod
+    def _transform_project(entity: Dict[str, Any]) -> Project:
+        metadata = entity.get("metadata") or _EMPTY
+        return Project(
+            name=metadata.get("name"),
+            uuid=metadata.get("uuid"),
+        )
+
+
+def _inventory_key(host: str, username: str, password: str, verify_ssl: Optional[bool]) -> InventoryKey:
+    # Keyed on a digest so a wrong password never hits a cached result and no plaintext is kept.
+    digest = hashlib.blake2b(password.encode(), digest_size=16).hexdigest()
+    return (host, username, digest, bool(verify_ssl))
+
+
+def cached_inventory(
+    host: str,
+    username: str,
+    password: str,
+    verify_ssl: Optional[bool] = False,
+) -> Optional[Dict[str, Any]]:
+    """Return a still-fresh inventory for these credentials without contacting Prism Central."""
+    key = _inventory_key(host, username, password, verify_ssl)
+    with _inventory_lock:
+        cached = _inventory_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del _inventory_cache[key]
+            return None
+        return cached[1]
+
+
+def bust_cache(host: Optional[str] = None) -> None:
+    """Drop cached inventories for ``host``, or all of them, e.g. after changing Prism objects."""
+    with _inventory_lock:
+        if host is None:
+            _inventory_cache.clear()
+            return
+        for key in [key for key in _inventory_cache if key[0] == host]:
+            del _inventory_cache[key]
+
+
+def _retire_client(client: PrismCentralClient, to_close: List[PrismCentralClient]) -> None:
+    """Mark a client dropped from _CLIENTS; it is closed now if idle, else when its last lease ends."""
+    client.retired = True
+    if client.leases == 0:
+        to_close.append(client)
+
+
+def _checkout_client(
+    host: str,
+    username: str,
+    password: str,
+    verify_ssl: Optional[bool],
+    lease: bool,
+) -> PrismCentralClient:
+    key = (host, username, bool(verify_ssl))
+    to_close: List[PrismCentralClient] = []
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.pop(key, None)
+        # A changed password gets a fresh session rather than reusing the old auth.
+        if client is not None and client.credentials.password != password:
+            _retire_client(client, to_close)
+            client = None
+        if client is None:
+            credentials = PrismCentralCredentials(
+                host=host, username=username, password=password, verify_ssl=verify_ssl or False
+            )
+            client = PrismCentralClient(credentials)
+        # Re-inserted so the dict stays in least-recently-used order.
+        _CLIENTS[key] = client
+        while len(_CLIENTS) > CLIENT_CACHE_SIZE:
+            _retire_client(_CLIENTS.pop(next(iter(_CLIENTS))), to_close)
+        if lease:
+            client.leases += 1
+    for stale in to_close:
+        stale.close()
+    return client
+
+
+def get_client(
+    host: str,
+    username: str,
+    password: str,
+    verify_ssl: Optional[bool] = False,
+) -> PrismCentralClient:
+    """Return the shared client for this login so its session keeps a warm TLS pool between calls.
+
+    The client is not leased: prefer leased_client() when other threads may replace or evict it mid-call.
+    """
+    return _checkout_client(host, username, password, verify_ssl, lease=False)
+
+
+@contextmanager
+def leased_client(
+    host: str,
+    username: str,
+    password: str,
+    verify_ssl: Optional[bool] = False,
+) -> Iterator[PrismCentralClient]:
+    """Like get_client(), but the session is not closed by a replacement or eviction until the block exits."""
+    client = _checkout_client(host, username, password, verify_ssl, lease=True)
+    try:
+        yield client
+    finally:
+        with _CLIENTS_LOCK:
+            client.leases -= 1
+            idle_retired = client.retired and client.leases == 0
+        if idle_retired:
+            client.close()
+
+
+def evict_client(key: ClientKey, client: PrismCentralClient) -> None:
+    to_close: List[PrismCentralClient] = []
+    with _CLIENTS_LOCK:
+        if _CLIENTS.get(key) is not client:
+            return
+        del _CLIENTS[key]
+        _retire_client(client, to_close)
+    for stale in to_close:
+        stale.close()
 
 
 def gather_inventory(
@@ -106,9 +545,29 @@ def gather_inventory(
     username: str,
     password: str,
     verify_ssl: Optional[bool] = False,
+    expires: Optional[float] = None,
 ) -> Dict[str, Any]:
-    credentials = PrismCentralCredentials(
-        host=host, username=username, password=password, verify_ssl=verify_ssl or False
-    )
-    client = PrismCentralClient(credentials)
-    return client.verify()
+    """Discover inventory, reusing a result from the last ``expires`` seconds (default 60, 0 to bypass)."""
+    ttl = INVENTORY_TTL_SECONDS if expires is None else expires
+    if ttl > 0:
+        inventory = cached_inventory(host, username, password, verify_ssl)
+        if inventory is not None:
+            return inventory
+
+    client_key = (host, username, bool(verify_ssl))
+    with leased_client(host, username, password, verify_ssl) as client:
+        try:
+            inventory = client.verify()
+        except HTTP_ERRORS as exc:
+            if exc.response is not None and exc.response.status_code == 401:
+                evict_client(client_key, client)
+            raise
+    if ttl > 0:
+        # Only successful lookups get here; errors propagate uncached.
+        key = _inventory_key(host, username, password, verify_ssl)
+        with _inventory_lock:
+            _inventory_cache.pop(key, None)
+            while len(_inventory_cache) >= INVENTORY_CACHE_SIZE:
+                del _inventory_cache[next(iter(_inventory_cache))]
+            _inventory_cache[key] = (time.monotonic() + ttl, inventory)
+    return inventory
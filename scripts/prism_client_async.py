@@ -0,0 +1,95 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from scripts.prism_client import (
+    LIST_PAGE_SIZE,
+    _EMPTY,
+    _next_offsets,
+    Cluster,
+    PrismCentralClient,
+    PrismCentralCredentials,
+    Project,
+    StorageContainer,
+    Subnet,
+    json_loads,
+)
+
+
+class AsyncPrismCentralClient:
+    """asyncio counterpart of PrismCentralClient for callers already inside an event loop."""
+
+    def __init__(self, credentials: PrismCentralCredentials) -> None:
+        self.credentials = credentials
+        self.base_url = f"https://{credentials.host}:9440/api/nutanix/v3"
+        self.session = aiohttp.ClientSession(
+            auth=aiohttp.BasicAuth(credentials.username, credentials.password),
+            connector=aiohttp.TCPConnector(ssl=None if credentials.verify_ssl else False, limit=8),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+
+    async def __aenter__(self) -> "AsyncPrismCentralClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{self.base_url}/{path}"
+        async with self.session.post(url, json=payload) as response:
+            response.raise_for_status()
+            return await response.json(loads=json_loads)
+
+    async def _paginate(self, kind: str, path: str, page: int = LIST_PAGE_SIZE) -> List[Dict[str, Any]]:
+        first = await self._post(path, {"kind": kind, "offset": 0, "length": page})
+        entities = list(first.get("entities") or ())
+        offsets = _next_offsets((first.get("metadata") or _EMPTY).get("total_matches"), len(entities))
+        pages = await asyncio.gather(
+            *(self._post(path, {"kind": kind, "offset": offset, "length": page}) for offset in offsets)
+        )
+        for data in pages:
+            entities.extend(data.get("entities") or ())
+        return entities
+
+    async def verify(self) -> Dict[str, Any]:
+        clusters, subnets, storage_containers, projects = await asyncio.gather(
+            self.list_clusters(),
+            self.list_subnets(),
+            self.list_storage_containers(),
+            self.list_projects(),
+        )
+        return {
+            "clusters": clusters,
+            "subnets": subnets,
+            "storage_containers": storage_containers,
+            "projects": projects,
+        }
+
+    async def list_clusters(self) -> List[Cluster]:
+        return [PrismCentralClient._transform_cluster(entity) for entity in await self._paginate("cluster", "clusters/list")]
+
+    async def list_subnets(self) -> List[Subnet]:
+        return [PrismCentralClient._transform_subnet(entity) for entity in await self._paginate("subnet", "subnets/list")]
+
+    async def list_storage_containers(self) -> List[StorageContainer]:
+        return [PrismCentralClient._transform_container(entity) for entity in await self._paginate("storage_container", "storage_containers/list")]
+
+    async def list_projects(self) -> List[Project]:
+        return [PrismCentralClient._transform_project(entity) for entity in await self._paginate("project", "projects/list")]
+
+
+async def gather_inventory_async(
+    host: str,
+    username: str,
+    password: str,
+    verify_ssl: Optional[bool] = False,
+) -> Dict[str, Any]:
+    credentials = PrismCentralCredentials(
+        host=host, username=username, password=password, verify_ssl=verify_ssl or False
+    )
+    async with AsyncPrismCentralClient(credentials) as client:
+        return await client.verify()
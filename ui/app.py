@@ -1,32 +1,141 @@
 from __future__ import annotations
 
-import json
 import os
+
+if __name__ == "__main__" and os.environ.get("FLASK_DEV") != "1":
+    try:
+        from gevent import monkey
+
+        monkey.patch_all()
+    except ImportError:
+        pass
+
+import atexit
+import fcntl
+import hashlib
+import io
 import queue
+import re
+import secrets
+import selectors
+import shlex
+import signal
 import subprocess
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import IO, Any, Collection, Dict, Iterator, List, Mapping, Tuple
 
 from flask import Flask, Response, jsonify, render_template, request, send_file
+from flask.json.provider import DefaultJSONProvider
+
+from scripts.prism_client import cached_inventory, gather_inventory
+
+try:
+    import ahocorasick
+except ImportError:  # optional; a compiled regex alternation is used instead
+    ahocorasick = None
+
+try:
+    import orjson
+
+    def json_dumpb(obj: Any, pretty: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    def json_dumps(obj: Any, pretty: bool = False) -> str:
+        return json_dumpb(obj, pretty).decode()
+
+    json_loads = orjson.loads
+except ImportError:  # fall back to ujson, then the standard library
+    orjson = None
+
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
 
-from scripts.prism_client import gather_inventory
+    def json_dumps(obj: Any, pretty: bool = False) -> str:
+        return _json.dumps(obj, indent=2) if pretty else _json.dumps(obj)
+
+    def json_dumpb(obj: Any, pretty: bool = False) -> bytes:
+        return json_dumps(obj, pretty).encode()
+
+    json_loads = _json.loads
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 ENV_FILE = BASE_DIR / "environment.env"
 DEPLOYMENT_FILE = BASE_DIR / "deployment.json"
 SCRIPTS_DIR = BASE_DIR / "scripts"
 
-app = Flask(__name__)
 
-log_queue: "queue.Queue[dict]" = queue.Queue()
-deployment_thread: threading.Thread | None = None
-deployment_lock = threading.Lock()
-deployment_active = False
+class OrjsonProvider(DefaultJSONProvider):
+    """Route jsonify() and request.get_json() through orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+SUBSCRIBER_BUFFER = 1024
+SSE_HEARTBEAT_SECONDS = 30.0
+SSE_HEARTBEAT = b": heartbeat\n\n"
+_SSE_SENTINEL = object()
+PIPE_READ_SIZE = 1 << 16
+PIPE_CAPACITY = 1 << 20
+# How long a cancelled step gets to exit after SIGTERM before its process group is SIGKILLed.
+CANCEL_GRACE_SECONDS = 10.0
+F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+subscribers: "set[Subscriber]" = set()
+subscribers_lock = threading.Lock()
+deployment_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nkp-deploy")
+deployment_future: Future | None = None
+_deploy_event = threading.Event()
+_cancel_requested = threading.Event()
+# Self-pipe that wakes the output reader when a cancel arrives.
+_cancel_pipe_r, _cancel_pipe_w = os.pipe()
+os.set_blocking(_cancel_pipe_r, False)
+os.set_blocking(_cancel_pipe_w, False)
+verify_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="nkp-verify")
+VERIFY_JOB_TTL_SECONDS = 60.0
+_verify_jobs: Dict[str, tuple[float, Future]] = {}
+_verify_jobs_lock = threading.Lock()
 current_mode = "automated"
+state: Dict[str, Any] = {"running": False, "progress": 0.0, "status": "idle", "step": ""}
+_state_lock = threading.Lock()
+PROGRESS_MIN_INTERVAL = 0.05
+_last_progress_ts = 0.0
+# Trailing-edge flush for a throttled progress frame, so the latest state always reaches SSE clients.
+_progress_flush: threading.Timer | None = None
+_config_cache: Dict[Path, tuple[tuple[int, int], Dict[str, Any]]] = {}
+_config_cache_lock = threading.Lock()
+_persist_queue: "queue.Queue[tuple[int, Dict[Path, bytes]]]" = queue.Queue()
+_persist_seq = 0
+_pending_config: tuple[int, Dict[str, Any]] | None = None
+# Digest of the last config handed to persist_config, and whether it passed validate_config.
+_last_saved: tuple[bytes, bool] = (b"", False)
+# (mtime_ns, size) of each config file right after config_writer last wrote it.
+_written_stamps: Dict[Path, tuple[int, int] | None] = {}
+_env_bytes = b""
+_env_etag = ""
+# Stamp of the environment.env the cached bytes came from; None forces a re-read.
+_env_stamp: tuple[int, int] | None = None
 SENSITIVE_FIELDS = {"PRISM_CENTRAL_PASSWORD"}
+ENV_LINE_RE = re.compile(
+    r"^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*[\"']?(.*?)[\"']?[ \t\r]*$",
+    re.MULTILINE,
+)
 
-DEFAULT_CONFIG: Dict[str, str] = {
+DEFAULT_CONFIG: Mapping[str, str] = MappingProxyType({
     "CLUSTER_NAME": "nkp-mgmt",
     "CONTROL_PLANE_1_ADDRESS": "192.168.1.51",
     "CONTROL_PLANE_2_ADDRESS": "192.168.1.52",
@@ -76,9 +185,9 @@ DEFAULT_CONFIG: Dict[str, str] = {
     "VERBOSE": "false",
     "DRY_RUN": "false",
     "FIPS_MODE": "false",
-}
+})
 
-FIELD_METADATA: Dict[str, Dict[str, str | list]] = {
+FIELD_METADATA: Mapping[str, Dict[str, str | list]] = MappingProxyType({
     "CLUSTER_NAME": {
         "label": "Cluster name",
         "tooltip": "Unique identifier for the NKP cluster.",
@@ -342,7 +451,7 @@ FIELD_METADATA: Dict[str, Dict[str, str | list]] = {
             {"label": "True", "value": "true"},
         ],
     },
-}
+})
 
 FIELD_SECTIONS: List[Dict[str, str | List[str]]] = [
     {
@@ -447,7 +556,7 @@ FIELD_SECTIONS: List[Dict[str, str | List[str]]] = [
     },
 ]
 
-REQUIRED_FIELDS = [
+REQUIRED_FIELDS: Tuple[str, ...] = (
     "CLUSTER_NAME",
     "CONTROL_PLANE_1_ADDRESS",
     "WORKER_1_ADDRESS",
@@ -455,8 +564,34 @@ REQUIRED_FIELDS = [
     "SSH_USER",
     "SSH_PRIVATE_KEY_FILE",
     "OUTPUT_DIR",
+)
+
+PRECOMPUTED_SECTIONS: List[Dict[str, Any]] = [
+    {
+        "id": section["id"],
+        "title": section["title"],
+        "description": section["description"],
+        "fields": [
+            {
+                "key": key,
+                "label": key,
+                "tooltip": "",
+                "placeholder": "",
+                "required": False,
+                "input_type": "text",
+                **FIELD_METADATA.get(key, {}),
+                "default": DEFAULT_CONFIG.get(key, ""),
+                "sensitive": key in SENSITIVE_FIELDS,
+            }
+            for key in section["fields"]
+        ],
+    }
+    for section in FIELD_SECTIONS
 ]
 
+SCHEMA_JSON = json_dumpb({"sections": PRECOMPUTED_SECTIONS, "defaults": dict(DEFAULT_CONFIG), "required": REQUIRED_FIELDS})
+SCHEMA_ETAG = hashlib.blake2b(SCHEMA_JSON, digest_size=8).hexdigest()
+
 PHASE_SETS: Dict[str, List[str]] = {
     "automated": [
         "Validate & prepare",
@@ -470,6 +605,8 @@ PHASE_SETS: Dict[str, List[str]] = {
         "Verify deployment",
     ],
 }
+PHASES_JSON = json_dumpb(PHASE_SETS)
+PHASES_ETAG = hashlib.blake2b(PHASES_JSON, digest_size=8).hexdigest()
 
 PHASE_COMMANDS: Dict[str, Tuple[str, List[str]]] = {
     "Deploy NKP": (
@@ -490,162 +627,393 @@ PHASE_COMMANDS: Dict[str, Tuple[str, List[str]]] = {
     ),
 }
 
-defaults = {
-    "PRISM_CENTRAL_IP": "",
-    "PRISM_CENTRAL_USERNAME": "",
-    "PRISM_CENTRAL_PASSWORD": "",
-    "PRISM_CENTRAL_VERIFY_SSL": False,
-    "TARGET_CLUSTER": "",
-    "TARGET_SUBNET": "",
-    "TARGET_PROJECT": "",
-    "STORAGE_CONTAINER": "",
-    "NODE_CIDR": "10.240.0.0/16",
-    "SERVICE_CIDR": "10.96.0.0/12",
-    "METALLB_IP_RANGE": "192.168.1.240-192.168.1.250",
-    "SSH_USERNAME": "ubuntu",
-    "SSH_PRIVATE_KEY_PATH": "~/.ssh/id_rsa",
-    "OUTPUT_DIRECTORY": "${PWD}/nkp-output",
-    "KUBECONFIG_PATH": "${OUTPUT_DIRECTORY}/nkp-mgmt.conf",
-    "DRY_RUN": False,
+PHASE_KEYWORDS: Dict[str, str] = {
+    "[start] validate-prereqs": "Validate & prepare",
+    "[start] prepare-nodes": "Validate & prepare",
+    "[start] deploy-nkp": "Deploy NKP",
+    "[start] verify-deployment": "Verify deployment",
 }
 
+if ahocorasick is not None:
+    _PHASE_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _phase in PHASE_KEYWORDS.items():
+        _PHASE_AUTOMATON.add_word(_keyword, _phase)
+    _PHASE_AUTOMATON.make_automaton()
+
+    def match_phase_keyword(lower_line: str) -> str | None:
+        for _, phase in _PHASE_AUTOMATON.iter(lower_line):
+            return phase
+        return None
+
+else:
+    _PHASE_KEYWORD_RE = re.compile("|".join(re.escape(keyword) for keyword in PHASE_KEYWORDS))
+
+    def match_phase_keyword(lower_line: str) -> str | None:
+        match = _PHASE_KEYWORD_RE.search(lower_line)
+        return PHASE_KEYWORDS[match.group(0)] if match else None
+
+
+def _merge(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """Overlay a submitted payload on a fresh copy of the frozen DEFAULT_CONFIG."""
+    merged = dict(DEFAULT_CONFIG)
+    merged.update(payload)
+    return merged
+
+
+def parse_env(data: bytes | str) -> Dict[str, str]:
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", "replace")
+    return dict(ENV_LINE_RE.findall(data))
+
+
+def read_config_file(path: Path) -> Dict[str, Any]:
+    if path == DEPLOYMENT_FILE:
+        return json_loads(path.read_bytes())
+    return parse_env(path.read_bytes())
+
+
+def file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 def load_config() -> Dict[str, Any]:
-    if CONFIG_FILE.exists():
-        return json.loads(CONFIG_FILE.read_text())
-    if ENV_FILE.exists():
-        parsed: Dict[str, Any] = {}
-        for line in ENV_FILE.read_text().splitlines():
-            if not line.strip() or line.strip().startswith("#"):
-                continue
-            clean_line = line.replace("export ", "", 1)
-            if "=" not in clean_line:
-                continue
-            key, value = clean_line.split("=", 1)
-            config[key.strip()] = value.strip().strip('"')
-    return config
-
-
-def format_env_lines(config: Dict[str, str], skip_keys: set[str] | None = None) -> List[str]:
-    skip_keys = skip_keys or set()
-    section_headers = [
-        ("CLUSTER CONFIGURATION", ["CLUSTER_NAME"]),
-        (
-            "NODE ADDRESSES",
-            [
-                "CONTROL_PLANE_1_ADDRESS",
-                "CONTROL_PLANE_2_ADDRESS",
-                "CONTROL_PLANE_3_ADDRESS",
-                "WORKER_1_ADDRESS",
-                "WORKER_2_ADDRESS",
-                "WORKER_3_ADDRESS",
-                "WORKER_4_ADDRESS",
-            ],
-        ),
-        (
-            "CONTROL PLANE ENDPOINT",
-            ["CONTROL_PLANE_ENDPOINT_HOST", "CONTROL_PLANE_ENDPOINT_PORT", "VIRTUAL_IP_INTERFACE"],
-        ),
-        ("SSH CONFIGURATION", ["SSH_USER", "SSH_PRIVATE_KEY_FILE", "SSH_PRIVATE_KEY_SECRET_NAME"]),
-        ("NETWORKING", ["METALLB_IP_RANGE", "POD_CIDR", "SERVICE_CIDR"]),
-        ("PROXY CONFIGURATION", ["HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY"]),
-        (
-            "STORAGE CONFIGURATION",
-            [
-                "STORAGE_PROVIDER",
-                "NUTANIX_ENDPOINT",
-                "NUTANIX_USER",
-                "NUTANIX_PASSWORD",
-                "PRISM_CENTRAL_PASSWORD",
-                "NUTANIX_CLUSTER_UUID",
-                "STORAGE_CONTAINER",
-            ],
-        ),
-        ("LICENSE", ["LICENSE_TYPE", "NKP_LICENSE_TOKEN"]),
-        (
-            "REGISTRY CONFIGURATION",
-            ["REGISTRY_MIRROR_URL", "REGISTRY_MIRROR_USERNAME", "REGISTRY_MIRROR_PASSWORD"],
-        ),
-        (
-            "AIR-GAPPED CONFIGURATION",
-            [
-                "AIRGAPPED",
-                "LOCAL_REGISTRY_URL",
-                "LOCAL_REGISTRY_CA_CERT",
-                "LOCAL_REGISTRY_USERNAME",
-                "LOCAL_REGISTRY_PASSWORD",
-                "NKP_BUNDLE_PATH",
-                "KONVOY_IMAGE_BUNDLE",
-                "KOMMANDER_IMAGE_BUNDLE",
-                "KOMMANDER_CHARTS_BUNDLE",
-            ],
-        ),
-        ("OUTPUT PATHS", ["OUTPUT_DIR", "KUBECONFIG_PATH"]),
-        (
-            "TIMINGS AND FLAGS",
-            ["CLUSTER_CREATE_TIMEOUT", "KOMMANDER_INSTALL_TIMEOUT", "NODE_READY_TIMEOUT", "VERBOSE", "DRY_RUN", "FIPS_MODE"],
-        ),
-    ]
-
-    lines: List[str] = ["# Generated by NKP Bastion Dashboard", "# Source this file before running deployment"]
-    for title, keys in section_headers:
-        lines.append("# =============================================================================")
-        lines.append(f"# {title}")
-        lines.append("# =============================================================================")
-        for key in keys:
-            if key in skip_keys:
-                continue
-            value = config.get(key, "")
-            lines.append(f"export {key}={shlex.quote(str(value))}")
-        lines.append("")
-    lines.append("export CONTROL_PLANE_NODES=\"${CONTROL_PLANE_1_ADDRESS} ${CONTROL_PLANE_2_ADDRESS} ${CONTROL_PLANE_3_ADDRESS}\"")
-    lines.append("export WORKER_NODES=\"${WORKER_1_ADDRESS} ${WORKER_2_ADDRESS} ${WORKER_3_ADDRESS} ${WORKER_4_ADDRESS}\"")
-    lines.append("export ALL_NODES=\"${CONTROL_PLANE_NODES} ${WORKER_NODES}\"")
-    lines.append("export CONTROL_PLANE_REPLICAS=$(echo ${CONTROL_PLANE_NODES} | wc -w)")
-    lines.append("export WORKER_REPLICAS=$(echo ${WORKER_NODES} | wc -w)")
-    lines.append("")
-    return lines
+    with _config_cache_lock:
+        if _pending_config is not None:
+            return _pending_config[1].copy()
+    for path in (DEPLOYMENT_FILE, ENV_FILE):
+        key = file_stamp(path)
+        if key is None:
+            continue
+        with _config_cache_lock:
+            cached = _config_cache.get(path)
+            if cached is None or cached[0] != key:
+                cached = (key, read_config_file(path))
+                _config_cache[path] = cached
+        return cached[1].copy()
+    return {}
+
+
+ENV_FILE_SECTIONS: List[Tuple[str, List[str]]] = [
+    ("CLUSTER CONFIGURATION", ["CLUSTER_NAME"]),
+    (
+        "NODE ADDRESSES",
+        [
+            "CONTROL_PLANE_1_ADDRESS",
+            "CONTROL_PLANE_2_ADDRESS",
+            "CONTROL_PLANE_3_ADDRESS",
+            "WORKER_1_ADDRESS",
+            "WORKER_2_ADDRESS",
+            "WORKER_3_ADDRESS",
+            "WORKER_4_ADDRESS",
+        ],
+    ),
+    (
+        "CONTROL PLANE ENDPOINT",
+        ["CONTROL_PLANE_ENDPOINT_HOST", "CONTROL_PLANE_ENDPOINT_PORT", "VIRTUAL_IP_INTERFACE"],
+    ),
+    ("SSH CONFIGURATION", ["SSH_USER", "SSH_PRIVATE_KEY_FILE", "SSH_PRIVATE_KEY_SECRET_NAME"]),
+    ("NETWORKING", ["METALLB_IP_RANGE", "POD_CIDR", "SERVICE_CIDR"]),
+    ("PROXY CONFIGURATION", ["HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY"]),
+    (
+        "STORAGE CONFIGURATION",
+        [
+            "STORAGE_PROVIDER",
+            "NUTANIX_ENDPOINT",
+            "NUTANIX_USER",
+            "NUTANIX_PASSWORD",
+            "PRISM_CENTRAL_PASSWORD",
+            "NUTANIX_CLUSTER_UUID",
+            "STORAGE_CONTAINER",
+        ],
+    ),
+    ("LICENSE", ["LICENSE_TYPE", "NKP_LICENSE_TOKEN"]),
+    (
+        "REGISTRY CONFIGURATION",
+        ["REGISTRY_MIRROR_URL", "REGISTRY_MIRROR_USERNAME", "REGISTRY_MIRROR_PASSWORD"],
+    ),
+    (
+        "AIR-GAPPED CONFIGURATION",
+        [
+            "AIRGAPPED",
+            "LOCAL_REGISTRY_URL",
+            "LOCAL_REGISTRY_CA_CERT",
+            "LOCAL_REGISTRY_USERNAME",
+            "LOCAL_REGISTRY_PASSWORD",
+            "NKP_BUNDLE_PATH",
+            "KONVOY_IMAGE_BUNDLE",
+            "KOMMANDER_IMAGE_BUNDLE",
+            "KOMMANDER_CHARTS_BUNDLE",
+        ],
+    ),
+    ("OUTPUT PATHS", ["OUTPUT_DIR", "KUBECONFIG_PATH"]),
+    (
+        "TIMINGS AND FLAGS",
+        ["CLUSTER_CREATE_TIMEOUT", "KOMMANDER_INSTALL_TIMEOUT", "NODE_READY_TIMEOUT", "VERBOSE", "DRY_RUN", "FIPS_MODE"],
+    ),
+]
+
+
+ENV_FILE_HEADER = "# Generated by NKP Bastion Dashboard\n# Source this file before running deployment\n"
+ENV_SECTION_HEADER = (
+    "# =============================================================================\n"
+    "# {title}\n"
+    "# =============================================================================\n"
+)
+ENV_FILE_TRAILER = (
+    'export CONTROL_PLANE_NODES="${CONTROL_PLANE_1_ADDRESS} ${CONTROL_PLANE_2_ADDRESS} ${CONTROL_PLANE_3_ADDRESS}"\n'
+    'export WORKER_NODES="${WORKER_1_ADDRESS} ${WORKER_2_ADDRESS} ${WORKER_3_ADDRESS} ${WORKER_4_ADDRESS}"\n'
+    'export ALL_NODES="${CONTROL_PLANE_NODES} ${WORKER_NODES}"\n'
+    "export CONTROL_PLANE_REPLICAS=$(echo ${CONTROL_PLANE_NODES} | wc -w)\n"
+    "export WORKER_REPLICAS=$(echo ${WORKER_NODES} | wc -w)\n"
+)
+
+
+def render_env_file(config: Dict[str, str], skip_keys: Collection[str] = ()) -> str:
+    parts: List[str] = [ENV_FILE_HEADER]
+    for title, keys in ENV_FILE_SECTIONS:
+        parts.append(ENV_SECTION_HEADER.format(title=title))
+        parts.extend(f"export {key}={shlex.quote(str(config.get(key, '')))}\n" for key in keys if key not in skip_keys)
+        parts.append("\n")
+    parts.append(ENV_FILE_TRAILER)
+    return "".join(parts)
 
 
 def validate_config(config: Dict[str, str]) -> List[str]:
-    missing = [field for field in REQUIRED_FIELDS if not str(config.get(field, "")).strip()]
-    return missing
+    return [field for field in REQUIRED_FIELDS if not str(config.get(field, "")).strip()]
+
+
+def write_file(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    # The rename replaces the inode, so carry over the target's mode (e.g. a chmod 600 from the
+    # README's security notes); files holding credentials are created owner-only.
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o600
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, mode)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def config_writer() -> None:
+    global _pending_config, _last_saved, _env_stamp
+    while True:
+        seq, files = _persist_queue.get()
+        taken = 1
+        # Coalesce queued saves: only the newest bytes for each file need to reach disk.
+        while True:
+            try:
+                seq, newer = _persist_queue.get_nowait()
+            except queue.Empty:
+                break
+            files = {**files, **newer}
+            taken += 1
+        try:
+            for path, data in files.items():
+                write_file(path, data)
+        except Exception:  # keep the writer alive; a dead thread would silently drop every later save
+            app.logger.exception("Failed to persist configuration")
+            with _config_cache_lock:
+                _last_saved = (b"", False)
+                _written_stamps.clear()
+                _env_stamp = None  # the cached bytes never reached disk; serve the file as it is
+        else:
+            with _config_cache_lock:
+                if seq == _persist_seq:
+                    _written_stamps.update((path, file_stamp(path)) for path in files)
+                    _env_stamp = _written_stamps.get(ENV_FILE, _env_stamp)
+        finally:
+            with _config_cache_lock:
+                _config_cache.clear()
+                if _pending_config is not None and _pending_config[0] == seq:
+                    _pending_config = None
+            for _ in range(taken):
+                _persist_queue.task_done()
+
+
+def remember_env_file(data: bytes, stamp: tuple[int, int] | None = None) -> None:
+    global _env_bytes, _env_etag, _env_stamp
+    _env_bytes = data
+    _env_etag = hashlib.blake2b(data, digest_size=8).hexdigest()
+    _env_stamp = stamp
+
+
+def current_env_file() -> tuple[bytes, str]:
+    """Download bytes and ETag, re-read when environment.env changed on disk since it was last read or written."""
+    with _config_cache_lock:
+        stamp = file_stamp(ENV_FILE)
+        if _pending_config is not None or stamp is None or stamp == _env_stamp:
+            return _env_bytes, _env_etag
+    try:
+        data = ENV_FILE.read_bytes()
+    except FileNotFoundError:
+        data = None
+    with _config_cache_lock:
+        # A save queued while we were reading is newer than what we read.
+        if data is not None and _pending_config is None:
+            remember_env_file(data, stamp)
+        return _env_bytes, _env_etag
+
+
+def config_digest(config: Dict[str, Any]) -> bytes:
+    return hashlib.blake2b(repr(sorted(config.items())).encode(), digest_size=16).digest()
+
+
+def saved_files_unchanged() -> bool:
+    """True while the config files are what this process last wrote; the caller holds _config_cache_lock."""
+    if _pending_config is not None:
+        return True  # our own write is still queued
+    return all(path in _written_stamps and file_stamp(path) == _written_stamps[path] for path in (ENV_FILE, DEPLOYMENT_FILE))
+
+
+def is_saved_valid_config(digest: bytes) -> bool:
+    with _config_cache_lock:
+        return _last_saved == (digest, True) and saved_files_unchanged()
 
 
-def persist_config(config: Dict[str, str]) -> Dict[str, str]:
+def persist_config(config: Dict[str, str], validated: bool = False) -> None:
+    global _persist_seq, _pending_config, _last_saved
+    digest = config_digest(config)
+    with _config_cache_lock:
+        if _last_saved[0] == digest and saved_files_unchanged():
+            # Identical to what is already on (or queued for) disk, and nobody has edited the files since.
+            _last_saved = (digest, _last_saved[1] or validated)
+            return
     redacted_config = config.copy()
     for key in SENSITIVE_FIELDS:
         if key in redacted_config:
             redacted_config[key] = "<redacted>" if config.get(key) else ""
 
-    lines = format_env_lines(config, skip_keys=SENSITIVE_FIELDS)
-    ENV_FILE.write_text("\n".join(lines))
-    DEPLOYMENT_FILE.write_text(json.dumps(redacted_config, indent=2))
-    return redacted_config
+    env_bytes = render_env_file(config, skip_keys=SENSITIVE_FIELDS).encode()
+    files = {ENV_FILE: env_bytes, DEPLOYMENT_FILE: json_dumpb(redacted_config, pretty=True)}
+    with _config_cache_lock:
+        # Same critical section as the queue put, so the download always matches the newest queued save.
+        remember_env_file(env_bytes)
+        _persist_seq += 1
+        _pending_config = (_persist_seq, redacted_config)
+        _persist_queue.put((_persist_seq, files))
+        _last_saved = (digest, validated)
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """Bounded frame buffer for one connected SSE client."""
+
+    buffer: "deque[tuple[str, bytes | object]]" = field(default_factory=lambda: deque(maxlen=SUBSCRIBER_BUFFER))
+    ready: threading.Condition = field(default_factory=threading.Condition)
+
+    def push(self, event_type: str, frame: bytes | object) -> None:
+        with self.ready:
+            if event_type == "progress" and self.buffer and self.buffer[-1][0] == "progress":
+                # Only the latest progress matters; replace one the client has not read yet.
+                self.buffer[-1] = (event_type, frame)
+            else:
+                self.buffer.append((event_type, frame))
+            self.ready.notify()
+
+    def drain(self, timeout: float) -> List[bytes | object]:
+        with self.ready:
+            if not self.ready.wait_for(lambda: self.buffer, timeout):
+                return []
+            frames = [frame for _, frame in self.buffer]
+            self.buffer.clear()
+        return frames
+
+
+def current_subscribers() -> "tuple[Subscriber, ...]":
+    with subscribers_lock:
+        return tuple(subscribers)
+
+
+def publish(event_type: str, frame: bytes | object) -> None:
+    for subscriber in current_subscribers():
+        subscriber.push(event_type, frame)
+
 
+def enqueue_event(event_type: str, message: Any) -> None:
+    publish(event_type, b"data: " + json_dumpb({"type": event_type, "message": message}) + b"\n\n")
 
-def enqueue_event(event_type: str, message: str) -> None:
-    log_queue.put({"type": event_type, "message": message})
+
+def close_streams() -> None:
+    publish("close", _SSE_SENTINEL)
+
+
+def progress_snapshot() -> Dict[str, Any]:
+    return {
+        "percent": state.get("progress", 0.0),
+        "status": state.get("status", "idle"),
+        "step": state.get("step", ""),
+    }
+
+
+def flush_progress() -> None:
+    global _last_progress_ts, _progress_flush
+    with _state_lock:
+        if _progress_flush is None:
+            return  # cancelled: a later frame already carried this state
+        _progress_flush = None
+        _last_progress_ts = time.monotonic()
+        snapshot = progress_snapshot()
+    enqueue_event("progress", snapshot)
 
 
 def update_state(progress: float | None = None, status: str | None = None, step: str | None = None) -> None:
-    if progress is not None:
-        state["progress"] = progress
-    if status is not None:
-        state["status"] = status
-    if step is not None:
-        state["step"] = step
-
-    enqueue_event(
-        "progress",
-        json.dumps(
-            {
-                "percent": state.get("progress", 0.0),
-                "status": state.get("status", "idle"),
-                "step": state.get("step", ""),
-            }
-        ),
-    )
+    global _last_progress_ts, _progress_flush
+    now = time.monotonic()
+    with _state_lock:
+        # Only percent-only updates are coalesced; a new step or status is always sent at once.
+        throttled = (
+            (status is None or status == state.get("status"))
+            and (step is None or step == state.get("step"))
+            and state.get("status") == "running"
+            and progress not in (0.0, 100.0)
+            and now - _last_progress_ts < PROGRESS_MIN_INTERVAL
+        )
+        if progress is not None:
+            state["progress"] = progress
+        if status is not None:
+            state["status"] = status
+        if step is not None:
+            state["step"] = step
+        if throttled:
+            if _progress_flush is None:
+                _progress_flush = threading.Timer(PROGRESS_MIN_INTERVAL - (now - _last_progress_ts), flush_progress)
+                _progress_flush.daemon = True
+                _progress_flush.start()
+            return
+        if _progress_flush is not None:
+            _progress_flush.cancel()
+            _progress_flush = None
+        _last_progress_ts = now
+        snapshot = progress_snapshot()
+
+    enqueue_event("progress", snapshot)
+
+
+def claim_deployment() -> bool:
+    with _state_lock:
+        if state["running"]:
+            return False
+        state["running"] = True
+        # Reset here rather than in run_deployment, so a cancel sent before the worker starts still counts.
+        _cancel_requested.clear()
+        drain_cancel_pipe()
+        return True
+
+
+def release_deployment() -> None:
+    with _state_lock:
+        state["running"] = False
 
 
 def build_command_sequence(mode: str, phases: List[str]) -> List[Tuple[str, List[str]]]:
@@ -663,73 +1031,213 @@ def build_command_sequence(mode: str, phases: List[str]) -> List[Tuple[str, List
 
 def detect_phase(line: str, mode: str) -> str | None:
     lower_line = line.lower()
-    for keyword, phase in PHASE_KEYWORDS.items():
-        if keyword in lower_line:
-            return phase
+    phase = match_phase_keyword(lower_line)
+    if phase:
+        return phase
     if mode == "automated" and "verify" in lower_line:
         return "Verify deployment"
     return None
 
 
-def run_deployment(mode: str, phases: List[str], extra_env: Dict[str, str] | None = None) -> None:
-    global deployment_active
-    with deployment_lock:
-        deployment_active = True
-
-    commands = build_command_sequence(mode, phases)
-    total_steps = len(commands) or 1
-    start_message = f"Starting {mode} deployment flow ({total_steps} step(s))"
-    enqueue_event("status", start_message)
-    enqueue_event("log", start_message)
-    update_state(progress=0.0, status="running", step="Initializing deployment")
-
-    for index, (label, command) in enumerate(commands, start=1):
-        step_start_percent = ((index - 1) / total_steps) * 100
-        enqueue_event("phase", label)
-        enqueue_event("status", f"Running {label}")
-        enqueue_event("log", f"[STEP {index}/{total_steps}] Starting {label}")
-        update_state(progress=step_start_percent, status="running", step=f"Starting {label}")
-
-        process = subprocess.Popen(
-            command,
-            cwd=str(BASE_DIR),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            env={**os.environ, **(extra_env or {})},
-        )
+def grow_pipe(stream: IO[bytes]) -> None:
+    try:
+        fcntl.fcntl(stream.fileno(), F_SETPIPE_SZ, PIPE_CAPACITY)
+    except OSError:
+        pass  # capped by /proc/sys/fs/pipe-max-size; keep the kernel default
+
+
+def drain_cancel_pipe() -> None:
+    try:
+        while os.read(_cancel_pipe_r, 64):
+            pass
+    except BlockingIOError:
+        pass
 
-        if process.stdout:
-            for line in process.stdout:
-                clean_line = line.rstrip()
-                enqueue_event("log", clean_line)
-                detected = detect_phase(clean_line, mode)
-                if detected:
-                    enqueue_event("phase", detected)
-
-        return_code = process.wait()
-        if return_code != 0:
-            enqueue_event("status", f"{label} failed with exit code {return_code}")
-            enqueue_event("log", f"[STEP {index}/{total_steps}] {label} failed with exit code {return_code}")
-            update_state(progress=(index / total_steps) * 100, status="error", step=f"{label} failed")
-            with deployment_lock:
-                deployment_active = False
+
+def request_cancel() -> None:
+    _cancel_requested.set()
+    try:
+        os.write(_cancel_pipe_w, b"x")
+    except BlockingIOError:
+        pass  # a wake-up byte is already pending
+
+
+def signal_step(process: subprocess.Popen, signum: int) -> None:
+    try:
+        # The step runs in its own session; signal its children too.
+        os.killpg(process.pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def iter_output_lines(process: subprocess.Popen, chunk_size: int = PIPE_READ_SIZE) -> Iterator[str]:
+    fd = process.stdout.fileno()
+    pending = bytearray()
+    with selectors.DefaultSelector() as sel:
+        sel.register(fd, selectors.EVENT_READ)
+        sel.register(_cancel_pipe_r, selectors.EVENT_READ)
+        while True:
+            events = sel.select(timeout=1.0)
+            if any(key.fd == _cancel_pipe_r for key, _ in events):
+                drain_cancel_pipe()
+                if _cancel_requested.is_set():
+                    signal_step(process, signal.SIGTERM)
+                    break
+            if not any(key.fd == fd for key, _ in events):
+                continue
+            chunk = os.read(fd, chunk_size)
+            if not chunk:
+                break
+            pending += chunk
+            end = pending.rfind(b"\n")
+            if end >= 0:
+                yield from pending[:end].decode("utf-8", "replace").split("\n")
+                del pending[: end + 1]
+    if pending:
+        yield pending.decode("utf-8", "replace")
+
+
+def wait_for_step(process: subprocess.Popen) -> int:
+    """Reap the step, escalating to SIGKILL if it outlives a cancel by CANCEL_GRACE_SECONDS."""
+    deadline: float | None = None
+    while True:
+        timeout = 1.0 if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            return process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            if deadline is not None:
+                signal_step(process, signal.SIGKILL)
+                return process.wait()
+            if _cancel_requested.is_set():
+                signal_step(process, signal.SIGTERM)
+                deadline = time.monotonic() + CANCEL_GRACE_SECONDS
+
+
+def run_deployment(mode: str, phases: List[str], extra_env: Dict[str, str] | None = None) -> None:
+    _deploy_event.set()
+    try:
+        commands = build_command_sequence(mode, phases)
+        total_steps = len(commands) or 1
+        start_message = f"Starting {mode} deployment flow ({total_steps} step(s))"
+        enqueue_event("status", start_message)
+        enqueue_event("log", start_message)
+        update_state(progress=0.0, status="running", step="Initializing deployment")
+
+        for index, (label, command) in enumerate(commands, start=1):
+            if _cancel_requested.is_set():
+                break
+            step_start_percent = ((index - 1) / total_steps) * 100
+            enqueue_event("phase", label)
+            enqueue_event("status", f"Running {label}")
+            enqueue_event("log", f"[STEP {index}/{total_steps}] Starting {label}")
+            update_state(progress=step_start_percent, status="running", step=f"Starting {label}")
+
+            process = subprocess.Popen(
+                command,
+                cwd=str(BASE_DIR),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                start_new_session=True,
+                env={**os.environ, **(extra_env or {})},
+            )
+
+            if process.stdout:
+                grow_pipe(process.stdout)
+                for line in iter_output_lines(process):
+                    clean_line = line.rstrip()
+                    enqueue_event("log", clean_line)
+                    detected = detect_phase(clean_line, mode)
+                    if detected:
+                        enqueue_event("phase", detected)
+
+            return_code = wait_for_step(process)
+            if _cancel_requested.is_set():
+                break
+            if return_code != 0:
+                enqueue_event("status", f"{label} failed with exit code {return_code}")
+                enqueue_event("log", f"[STEP {index}/{total_steps}] {label} failed with exit code {return_code}")
+                update_state(progress=(index / total_steps) * 100, status="error", step=f"{label} failed")
+                return
+
+            enqueue_event("log", f"[STEP {index}/{total_steps}] Completed {label}")
+            update_state(progress=(index / total_steps) * 100, status="running", step=f"Completed {label}")
+
+        if _cancel_requested.is_set():
+            enqueue_event("status", "Deployment cancelled")
+            enqueue_event("log", "Deployment cancelled by user")
+            update_state(status="error", step="Deployment cancelled")
             return
 
-        enqueue_event("log", f"[STEP {index}/{total_steps}] Completed {label}")
-        update_state(progress=(index / total_steps) * 100, status="running", step=f"Completed {label}")
+        enqueue_event("status", "Deployment flow completed")
+        enqueue_event("log", "All deployment steps completed")
+        update_state(progress=100.0, status="complete", step="Deployment flow completed")
+    finally:
+        _deploy_event.clear()
+        release_deployment()
+        close_streams()
+
+
+def submit_deployment(mode: str, phases: List[str], extra_env: Dict[str, str] | None = None) -> Future:
+    global deployment_future
+    deployment_future = deployment_pool.submit(run_deployment, mode, phases, extra_env)
+    return deployment_future
+
+
+def describe_deployment_job() -> Dict[str, Any] | None:
+    future = deployment_future
+    if future is None:
+        return None
+    error = future.exception() if future.done() and not future.cancelled() else None
+    return {
+        "running": future.running(),
+        "done": future.done(),
+        "error": str(error) if error else None,
+    }
+
+
+def submit_verify_job(host: str, username: str, password: str, verify_ssl: bool) -> str:
+    job_id = secrets.token_urlsafe(12)
+    now = time.monotonic()
+    with _verify_jobs_lock:
+        # Forget finished jobs nobody came back for.
+        for stale_id, (created, future) in list(_verify_jobs.items()):
+            if future.done() and now - created > VERIFY_JOB_TTL_SECONDS:
+                del _verify_jobs[stale_id]
+        _verify_jobs[job_id] = (now, verify_pool.submit(gather_inventory, host, username, password, verify_ssl))
+    return job_id
+
+
+def warm_env_cache() -> None:
+    """Load the downloadable env file into memory; saves and current_env_file() keep it current afterwards."""
+    try:
+        stamp = file_stamp(ENV_FILE)
+        remember_env_file(ENV_FILE.read_bytes(), stamp)
+        return
+    except FileNotFoundError:
+        pass
+    except OSError:
+        app.logger.exception("Failed to read %s", ENV_FILE)
+    try:
+        config: Mapping[str, Any] = load_config()
+    except (OSError, ValueError):
+        # Importing the app (wsgi.py included) must not fail on a corrupt deployment.json.
+        app.logger.exception("Failed to load saved configuration; serving defaults until the next save")
+        config = DEFAULT_CONFIG
+    remember_env_file(render_env_file(config, skip_keys=SENSITIVE_FIELDS).encode())
 
-    enqueue_event("status", "Deployment flow completed")
-    enqueue_event("log", "All deployment steps completed")
-    update_state(progress=100.0, status="complete", step="Deployment flow completed")
-    with deployment_lock:
-        deployment_active = False
+warm_env_cache()
+threading.Thread(target=config_writer, name="config-writer", daemon=True).start()
+atexit.register(_persist_queue.join)
+atexit.register(deployment_pool.shutdown, wait=False)
+atexit.register(verify_pool.shutdown, wait=False)
 
 
 @app.route("/")
 def index() -> str:
-    return render_template("index.html", config=load_config())
+    return render_template(
+        "index.html", sections=PRECOMPUTED_SECTIONS, phase_sets=PHASE_SETS, config=load_config()
+    )
 
 
 @app.route("/api/verify", methods=["POST"])
@@ -743,8 +1251,26 @@ def api_verify():
     if not host or not username or not password:
         return jsonify({"error": "Prism Central IP, username, and password are required."}), 400
 
+    inventory = cached_inventory(host, username, password, verify_ssl)
+    if inventory is not None:
+        return jsonify({"success": True, "inventory": inventory})
+    job_id = submit_verify_job(host, username, password, verify_ssl)
+    return jsonify({"success": True, "job_id": job_id, "status": "pending"}), 202
+
+
+@app.route("/api/verify/<job_id>")
+def api_verify_job(job_id: str):
+    with _verify_jobs_lock:
+        job = _verify_jobs.get(job_id)
+        if job is None:
+            return jsonify({"success": False, "error": "Unknown verification job"}), 404
+        future = job[1]
+        if not future.done():
+            return jsonify({"success": True, "job_id": job_id, "status": "pending"}), 202
+        del _verify_jobs[job_id]
+
     try:
-        inventory = gather_inventory(host, username, password, verify_ssl)
+        inventory = future.result()
         return jsonify({"success": True, "inventory": inventory})
     except Exception as exc:  # noqa: BLE001
         return jsonify({"success": False, "error": str(exc)}), 500
@@ -753,16 +1279,20 @@ def api_verify():
 @app.route("/api/save-config", methods=["POST"])
 def api_save_config():
     data = request.json or {}
-    merged = {**defaults, **data}
-    persist_config(merged)
+    persist_config(_merge(data))
     return jsonify({"success": True})
 
 
 @app.route("/api/download-config")
 def api_download_config():
-    if not ENV_FILE.exists():
-        persist_config(load_config())
-    return send_file(ENV_FILE, as_attachment=True, download_name="environment.env")
+    data, etag = current_env_file()
+    return send_file(
+        io.BytesIO(data),
+        as_attachment=True,
+        download_name="environment.env",
+        etag=etag,
+        conditional=True,
+    )
 
 
 @app.route("/api/upload-config", methods=["POST"])
@@ -770,35 +1300,38 @@ def api_upload_config():
     if "file" not in request.files:
         return jsonify({"error": "No file provided"}), 400
     file = request.files["file"]
-    content = file.read().decode()
-    parsed: Dict[str, Any] = {}
+    raw = file.stream.read()
     try:
-        parsed = json.loads(content)
-    except json.JSONDecodeError:
-        for line in content.splitlines():
-            if not line.strip() or line.strip().startswith("#"):
-                continue
-            if "=" in line:
-                key, value = line.split("=", 1)
-                parsed[key.strip()] = value.strip().strip('"')
-    persist_config({**defaults, **parsed})
+        parsed = json_loads(raw)
+    except ValueError:
+        parsed = parse_env(raw)
+    persist_config(_merge(parsed))
     return jsonify({"success": True, "config": load_config()})
 
 
 @app.route("/api/run", methods=["POST"])
 def api_run():
-    if state.get("running"):
+    if not claim_deployment():
         return jsonify({"error": "Deployment already running"}), 409
-    persist_config(request.json or load_config())
-    thread = threading.Thread(target=run_deployment, daemon=True)
-    thread.start()
+    try:
+        persist_config(request.json or load_config())
+        submit_deployment("automated", PHASE_SETS["automated"])
+    except Exception:
+        release_deployment()
+        raise
     return jsonify({"success": True})
 
 @app.route("/api/config", methods=["POST"])
 def save_config() -> Response:
     payload = request.get_json(force=True)
-    merged_config = DEFAULT_CONFIG.copy()
-    merged_config.update({k: str(v) for k, v in payload.items()})
+    merged_config = _merge({k: str(v) for k, v in payload.items()})
+    digest = config_digest(merged_config)
+    if is_saved_valid_config(digest):
+        return jsonify(
+            {
+                "message": f"Saved configuration to {ENV_FILE} (sensitive fields redacted)",
+            }
+        )
     missing = validate_config(merged_config)
     if missing:
         return (
@@ -810,7 +1343,7 @@ def save_config() -> Response:
             ),
             400,
         )
-    persist_config(merged_config)
+    persist_config(merged_config, validated=True)
     return jsonify(
         {
             "message": f"Saved configuration to {ENV_FILE} (sensitive fields redacted)",
@@ -820,10 +1353,7 @@ def save_config() -> Response:
 
 @app.route("/api/start", methods=["POST"])
 def start_deployment() -> Response:
-    global deployment_thread, current_mode
-
-    if deployment_active:
-        return jsonify({"message": "A deployment is already running."}), 400
+    global current_mode
 
     data = request.get_json(force=True)
     mode = data.get("mode", "automated")
@@ -845,32 +1375,54 @@ def start_deployment() -> Response:
             400,
         )
 
+    if not claim_deployment():
+        return jsonify({"message": "A deployment is already running."}), 400
+
     current_mode = mode
     update_state(progress=0.0, status="running", step="Queued deployment")
 
-    deployment_thread = threading.Thread(
-        target=run_deployment, args=(mode, phases, runtime_env), daemon=True
-    )
-    deployment_thread.start()
+    submit_deployment(mode, phases, runtime_env)
     return jsonify({"message": f"Started {mode} deployment", "mode": mode, "phases": phases})
 
 
+@app.route("/api/cancel", methods=["POST"])
+def cancel_deployment() -> Response:
+    with _state_lock:
+        # Covers a deployment that has been claimed but not yet picked up by the worker.
+        if not state["running"]:
+            return jsonify({"error": "No deployment running"}), 409
+        request_cancel()
+    return jsonify({"success": True})
+
+
 @app.route("/api/status")
 def get_status() -> Response:
-    return jsonify({"active": deployment_active, "mode": current_mode, "state": state})
+    with _state_lock:
+        snapshot = dict(state)
+    return jsonify(
+        {"active": _deploy_event.is_set(), "mode": current_mode, "state": snapshot, "job": describe_deployment_job()}
+    )
 
 
 @app.route("/stream")
 def stream() -> Response:
     def event_stream():
-        while True:
-            try:
-                message = log_queue.get(timeout=1)
-                yield f"data: {json.dumps({'message': message})}\n\n"
-            except queue.Empty:
-                if not state.get("running"):
-                    break
-                continue
+        subscriber = Subscriber()
+        with subscribers_lock:
+            subscribers.add(subscriber)
+        try:
+            while True:
+                frames = subscriber.drain(SSE_HEARTBEAT_SECONDS)
+                if not frames:
+                    yield SSE_HEARTBEAT
+                    continue
+                for frame in frames:
+                    if frame is _SSE_SENTINEL:
+                        return
+                    yield frame
+        finally:
+            with subscribers_lock:
+                subscribers.discard(subscriber)
 
     return Response(event_stream(), mimetype="text/event-stream")
 
@@ -880,10 +1432,32 @@ def api_stream() -> Response:
     return stream()
 
 
+def static_json_response(body: bytes, etag: str, max_age: int) -> Response:
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response.make_conditional(request)
+
+
+@app.route("/api/schema")
+def get_schema() -> Response:
+    return static_json_response(SCHEMA_JSON, SCHEMA_ETAG, max_age=3600)
+
+
 @app.route("/api/phases")
 def get_phases() -> Response:
-    return jsonify(PHASE_SETS)
+    return static_json_response(PHASES_JSON, PHASES_ETAG, max_age=300)
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 8080)), debug=True)
+    port = int(os.environ.get("PORT", 8080))
+    if os.environ.get("FLASK_DEV") == "1":
+        # Reloader and debugger for local development only.
+        app.run(host="0.0.0.0", port=port, debug=True)
+    else:
+        try:
+            from gevent.pywsgi import WSGIServer
+        except ImportError:
+            app.run(host="0.0.0.0", port=port, threaded=True)
+        else:
+            WSGIServer(("0.0.0.0", port), app).serve_forever()
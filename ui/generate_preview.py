@@ -1,16 +1,37 @@
 from __future__ import annotations
 
+import functools
+import gzip
+import hashlib
 import html
+import io
 import json
+import os
+import re
 from pathlib import Path
-from string import Template
-from textwrap import dedent
+from types import MappingProxyType
+from typing import Any, Mapping
+
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:  # same compact, UTF-8 output from the standard library
+
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+try:  # optional: a .br sibling is only written when brotli is installed
+    import brotli
+except ImportError:
+    brotli = None
 
 # Static preview generator for the UI without Flask runtime dependencies.
 # It renders the configuration form with defaults, phase cards, and a mocked
 # progress/terminal view into static/preview.html for quick visualization.
 
-DEFAULT_CONFIG = {
+DEFAULT_CONFIG: Mapping[str, str] = MappingProxyType({
     "CLUSTER_NAME": "nkp-mgmt",
     "CONTROL_PLANE_1_ADDRESS": "192.168.1.51",
     "CONTROL_PLANE_2_ADDRESS": "192.168.1.52",
@@ -59,9 +80,9 @@ DEFAULT_CONFIG = {
     "VERBOSE": "false",
     "DRY_RUN": "false",
     "FIPS_MODE": "false",
-}
+})
 
-FIELD_METADATA = {
+FIELD_METADATA: Mapping[str, Mapping[str, Any]] = MappingProxyType({
     "CLUSTER_NAME": {
         "label": "Cluster name",
         "tooltip": "Unique identifier for the NKP cluster.",
@@ -313,14 +334,15 @@ FIELD_METADATA = {
             {"label": "True", "value": "true"},
         ],
     },
-}
+})
 
-FIELD_SECTIONS = [
+# Frozen so the fragments pre-rendered from it at import cannot go stale.
+FIELD_SECTIONS: tuple[Mapping[str, Any], ...] = (
     {
         "id": "cluster",
         "title": "Cluster",
         "description": "Name and node endpoints for your management cluster.",
-        "fields": [
+        "fields": (
             "CLUSTER_NAME",
             "CONTROL_PLANE_1_ADDRESS",
             "CONTROL_PLANE_2_ADDRESS",
@@ -329,62 +351,62 @@ FIELD_SECTIONS = [
             "WORKER_2_ADDRESS",
             "WORKER_3_ADDRESS",
             "WORKER_4_ADDRESS",
-        ],
+        ),
     },
     {
         "id": "vip",
         "title": "Control plane endpoint",
         "description": "Kubernetes API VIP and port exposed to clients.",
-        "fields": ["CONTROL_PLANE_ENDPOINT_HOST", "CONTROL_PLANE_ENDPOINT_PORT", "VIRTUAL_IP_INTERFACE"],
+        "fields": ("CONTROL_PLANE_ENDPOINT_HOST", "CONTROL_PLANE_ENDPOINT_PORT", "VIRTUAL_IP_INTERFACE"),
     },
     {
         "id": "access",
         "title": "Access & SSH",
         "description": "Connectivity used by the bastion to manage the nodes.",
-        "fields": ["SSH_USER", "SSH_PRIVATE_KEY_FILE", "SSH_PRIVATE_KEY_SECRET_NAME"],
+        "fields": ("SSH_USER", "SSH_PRIVATE_KEY_FILE", "SSH_PRIVATE_KEY_SECRET_NAME"),
     },
     {
         "id": "network",
         "title": "Networking",
         "description": "Pod, service, and load balancer ranges.",
-        "fields": ["METALLB_IP_RANGE", "POD_CIDR", "SERVICE_CIDR"],
+        "fields": ("METALLB_IP_RANGE", "POD_CIDR", "SERVICE_CIDR"),
     },
     {
         "id": "proxy",
         "title": "Proxy configuration",
         "description": "Optional proxies for outbound traffic.",
-        "fields": ["HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY"],
+        "fields": ("HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY"),
     },
     {
         "id": "storage",
         "title": "Storage",
         "description": "Select a storage backend and provide provider-specific values.",
-        "fields": [
+        "fields": (
             "STORAGE_PROVIDER",
             "NUTANIX_ENDPOINT",
             "NUTANIX_USER",
             "NUTANIX_PASSWORD",
             "NUTANIX_CLUSTER_UUID",
             "STORAGE_CONTAINER",
-        ],
+        ),
     },
     {
         "id": "license",
         "title": "Licensing",
         "description": "Choose license tier and token (if applying now).",
-        "fields": ["LICENSE_TYPE", "NKP_LICENSE_TOKEN"],
+        "fields": ("LICENSE_TYPE", "NKP_LICENSE_TOKEN"),
     },
     {
         "id": "registry",
         "title": "Registry",
         "description": "Mirror or upstream registry credentials.",
-        "fields": ["REGISTRY_MIRROR_URL", "REGISTRY_MIRROR_USERNAME", "REGISTRY_MIRROR_PASSWORD"],
+        "fields": ("REGISTRY_MIRROR_URL", "REGISTRY_MIRROR_USERNAME", "REGISTRY_MIRROR_PASSWORD"),
     },
     {
         "id": "airgap",
         "title": "Air-gapped options",
         "description": "Bundle and private registry settings.",
-        "fields": [
+        "fields": (
             "AIRGAPPED",
             "LOCAL_REGISTRY_URL",
             "LOCAL_REGISTRY_CA_CERT",
@@ -394,28 +416,28 @@ FIELD_SECTIONS = [
             "KONVOY_IMAGE_BUNDLE",
             "KOMMANDER_IMAGE_BUNDLE",
             "KOMMANDER_CHARTS_BUNDLE",
-        ],
+        ),
     },
     {
         "id": "output",
         "title": "Output paths",
         "description": "Where artifacts and kubeconfigs are written.",
-        "fields": ["OUTPUT_DIR", "KUBECONFIG_PATH"],
+        "fields": ("OUTPUT_DIR", "KUBECONFIG_PATH"),
     },
     {
         "id": "timeouts",
         "title": "Timeouts & flags",
         "description": "Operational timeouts and feature toggles.",
-        "fields": [
+        "fields": (
             "CLUSTER_CREATE_TIMEOUT",
             "KOMMANDER_INSTALL_TIMEOUT",
             "NODE_READY_TIMEOUT",
             "VERBOSE",
             "DRY_RUN",
             "FIPS_MODE",
-        ],
+        ),
     },
-]
+)
 
 PHASE_SETS = {
     "automated": [
@@ -440,7 +462,7 @@ SAMPLE_LOG_LINES = [
     "[info] Ready to launch automated workflow",
 ]
 
-HTML_SHELL = Template("""\
+HTML_SHELL = """\
 <!doctype html>
 <html lang=\"en\">
 <head>
@@ -494,7 +516,7 @@ HTML_SHELL = Template("""\
                 </div>
             </div>
             <form id=\"config-form\">
-                <div class=\"section-list\">$sections</div>
+                <div class=\"section-list\">{SECTIONS}</div>
             </form>
         </section>
 
@@ -531,7 +553,7 @@ HTML_SHELL = Template("""\
 </div>
 
 <script>
-    const phaseSets = $phase_sets;
+    const phaseSets = {PHASE_SETS};
     const terminalOutput = document.getElementById('terminal-output');
     const progressBar = document.getElementById('progress-bar');
     const phaseList = document.getElementById('phase-list');
@@ -550,9 +572,9 @@ HTML_SHELL = Template("""\
         const minutes = Math.floor((totalSeconds % 3600) / 60);
         const seconds = totalSeconds % 60;
         if (hours > 0) {
-            return `$${hours.toString().padStart(2, '0')}:$${minutes.toString().padStart(2, '0')}:$${seconds.toString().padStart(2, '0')}`;
+            return `${hours.toString().padStart(2, '0')}:${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
         }
-        return `$${minutes.toString().padStart(2, '0')}:$${seconds.toString().padStart(2, '0')}`;
+        return `${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
     }
 
     function ensureTimerInterval() {
@@ -601,7 +623,7 @@ HTML_SHELL = Template("""\
             const card = document.createElement('div');
             card.className = 'phase-card pending';
             card.dataset.label = phase;
-            card.innerHTML = `<div class="phase-title">$${phase}</div><div class="phase-meta"><div class="phase-status">Pending</div><div class="phase-timer">--:--</div></div>`;
+            card.innerHTML = `<div class="phase-title">${phase}</div><div class="phase-meta"><div class="phase-status">Pending</div><div class="phase-timer">--:--</div></div>`;
             if (mode === 'phased') {
                 const checkbox = document.createElement('input');
                 checkbox.type = 'checkbox';
@@ -632,7 +654,8 @@ HTML_SHELL = Template("""\
     }
 
     function appendTerminalLine(text) {
-        terminalOutput.textContent += `\n$${text}`;
+        const lines = Array.isArray(text) ? text : [text];
+        terminalOutput.textContent += `\n${lines.join('\\n')}`;
         terminalOutput.scrollTop = terminalOutput.scrollHeight;
     }
 
@@ -660,15 +683,20 @@ HTML_SHELL = Template("""\
     modeInputs.forEach(input => input.addEventListener('change', (e) => renderPhases(e.target.value)));
 
     // Seed the terminal with example output.
-    $terminal_lines
+    {TERMINAL_LINES}
     simulate();
     updateTimers();
 </script>
 </body>
 </html>
-""")
+"""
 
-def render_field(key: str) -> str:
+def _render_option_html(selected: str, opt: Mapping[str, Any]) -> str:
+    value = str(opt.get("value", ""))
+    label = str(opt.get("label", value))
+    return f'<option value="{html.escape(value)}" {"selected" if value == selected else ""}>{html.escape(label)}</option>'
+
+def _render_field_html(key: str) -> str:
     meta = FIELD_METADATA.get(key, {})
     label = html.escape(meta.get("label", key))
     tooltip = meta.get("tooltip")
@@ -678,14 +706,8 @@ def render_field(key: str) -> str:
     input_type = meta.get("input_type", "text")
     value = html.escape(DEFAULT_CONFIG.get(key, ""))
 
-    tooltip_html = f'<span class="tooltip" title="{html.escape(tooltip)}">?</span>' if tooltip else ""
-    required_html = '<span class="required">*</span>' if required else ""
-
     if options:
-        option_html = "".join(
-            f'<option value="{html.escape(str(opt.get("value", "")))}" {"selected" if str(opt.get("value", "")) == DEFAULT_CONFIG.get(key, "") else ""}>{html.escape(str(opt.get("label", opt.get("value", ""))))}</option>'
-            for opt in options
-        )
+        option_html = "".join(map(functools.partial(_render_option_html, DEFAULT_CONFIG.get(key, "")), options))
         control = f"<select name=\"{key}\">{option_html}</select>"
     else:
         control = (
@@ -693,57 +715,104 @@ def render_field(key: str) -> str:
             f'placeholder="{placeholder}">'  # noqa: E501
         )
 
-    return dedent(
-        f"""
-        <div class=\"field\">
-            <label>
-                {label}
-                {tooltip_html}
-                {required_html}
-            </label>
-            {control}
-        </div>
-        """
+    buf = io.StringIO()
+    buf.write(f'<div class="field">\n    <label>\n        {label}\n')
+    if tooltip:
+        buf.write(f'        <span class="tooltip" title="{html.escape(tooltip)}">?</span>\n')
+    if required:
+        buf.write('        <span class="required">*</span>\n')
+    buf.write(f"    </label>\n    {control}\n</div>\n")
+    return buf.getvalue()
+
+def _render_section_html(section: dict) -> str:
+    buf = io.StringIO()
+    buf.write(
+        '<div class="section">\n'
+        '    <div class="section-header">\n'
+        "        <div>\n"
+        f'            <p class="eyebrow">{html.escape(section["title"])}</p>\n'
+        f'            <p class="muted">{html.escape(section["description"])}</p>\n'
+        "        </div>\n"
+        f'        <span class="pill">{html.escape(section["id"])}</span>\n'
+        "    </div>\n"
+        '    <div class="field-grid">\n'
     )
+    for key in section["fields"]:
+        buf.write(_FIELD_HTML[key])
+    buf.write("    </div>\n</div>\n")
+    return buf.getvalue()
+
+# Escaped, fully rendered fragments for every field and section, built once at import.
+_FIELD_HTML = {key: _render_field_html(key) for section in FIELD_SECTIONS for key in section["fields"]}
+_SECTION_HTML = {section["id"]: _render_section_html(section) for section in FIELD_SECTIONS}
+
+def render_field(key: str) -> str:
+    html_fragment = _FIELD_HTML.get(key)
+    return html_fragment if html_fragment is not None else _render_field_html(key)
 
 def render_sections() -> str:
-    blocks = []
-    for section in FIELD_SECTIONS:
-        fields_html = "".join(render_field(key) for key in section["fields"])
-        block = dedent(
-            f"""
-            <div class=\"section\">
-                <div class=\"section-header\">
-                    <div>
-                        <p class=\"eyebrow\">{html.escape(section['title'])}</p>
-                        <p class=\"muted\">{html.escape(section['description'])}</p>
-                    </div>
-                    <span class=\"pill\">{html.escape(section['id'])}</span>
-                </div>
-                <div class=\"field-grid\">
-                    {fields_html}
-                </div>
-            </div>
-            """
-        )
-        blocks.append(block)
-    return "".join(blocks)
+    return "".join(_SECTION_HTML[section["id"]] for section in FIELD_SECTIONS)
 
 def render_terminal_lines() -> str:
-    lines_js = "".join(f"appendTerminalLine({json.dumps(line)});" for line in SAMPLE_LOG_LINES)
-    return lines_js
+    # One array literal and one DOM write instead of a call (and reflow) per line.
+    return f"appendTerminalLine({json_dumps(SAMPLE_LOG_LINES)});"
+
+# Every input is a module constant, so the fragments are rendered once per process.
+SECTIONS_HTML = render_sections()
+TERMINAL_LINES_JS = render_terminal_lines()
+PHASE_SETS_JSON = json_dumps(PHASE_SETS)
 
+# Indentation and blank lines only; line breaks stay so // comments and template literals keep working.
+LEADING_WHITESPACE_RE = re.compile(r"\n\s+")
+
+def minify(markup: str) -> str:
+    return LEADING_WHITESPACE_RE.sub("\n", markup)
+
+@functools.lru_cache(maxsize=1)
 def build_preview() -> str:
-    return HTML_SHELL.substitute(
-        sections=render_sections(),
-        phase_sets=json.dumps(PHASE_SETS),
-        terminal_lines=render_terminal_lines(),
+    # Literal markers rather than string.Template, so the JS template literals need no $$ escaping.
+    return minify(
+        HTML_SHELL.replace("{PHASE_SETS}", PHASE_SETS_JSON)
+        .replace("{TERMINAL_LINES}", TERMINAL_LINES_JS)
+        .replace("{SECTIONS}", SECTIONS_HTML)
     )
 
+def write_output(path: Path, data: bytes) -> None:
+    # One unbuffered binary write of the pre-encoded bytes; no TextIOWrapper in between.
+    # Written beside the target and renamed over it, so readers never see a partial file.
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def write_if_changed(path: Path, data: bytes) -> None:
+    try:
+        existing = path.read_bytes()
+    except FileNotFoundError:
+        existing = b""
+    if hashlib.blake2b(existing, digest_size=16).digest() == hashlib.blake2b(data, digest_size=16).digest():
+        print(f"{path.relative_to(Path.cwd())} is up to date")
+        return
+    write_output(path, data)
+    print(f"Wrote {path.relative_to(Path.cwd())}")
+
 def main() -> None:
     output_path = Path(__file__).resolve().parent / "static" / "preview.html"
-    output_path.write_text(build_preview(), encoding="utf-8")
-    print(f"Wrote {output_path.relative_to(Path.cwd())}")
+    data = build_preview().encode("utf-8")
+    write_if_changed(output_path, data)
+    # Precompressed siblings for servers that can send them as-is; mtime=0 keeps the .gz reproducible.
+    write_if_changed(output_path.with_name(output_path.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_if_changed(output_path.with_name(output_path.name + ".br"), brotli.compress(data, quality=11))
 
 
 if __name__ == "__main__":
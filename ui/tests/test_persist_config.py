@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+UI_DIR = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(UI_DIR.parent), str(UI_DIR)]
+
+import app  # noqa: E402
+
+
+class PersistConfigTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        tmp_dir = Path(self.tmp.name)
+        for name, path in (("ENV_FILE", tmp_dir / "environment.env"), ("DEPLOYMENT_FILE", tmp_dir / "deployment.json")):
+            original = getattr(app, name)
+            setattr(app, name, path)
+            self.addCleanup(setattr, app, name, original)
+        app._last_saved = (b"", False)
+        app._written_stamps.clear()
+        self.client = app.app.test_client()
+
+    def save(self, **overrides: str) -> None:
+        response = self.client.post("/api/config", json={**app.DEFAULT_CONFIG, **overrides})
+        self.assertEqual(response.status_code, 200)
+        app._persist_queue.join()
+
+    def test_save_keeps_existing_file_mode(self) -> None:
+        self.save()
+        os.chmod(app.ENV_FILE, 0o600)
+        self.save(CLUSTER_NAME="renamed")
+        self.assertIn(b"renamed", app.ENV_FILE.read_bytes())
+        self.assertEqual(os.stat(app.ENV_FILE).st_mode & 0o777, 0o600)
+
+    def test_new_files_are_owner_only(self) -> None:
+        self.save()
+        self.assertEqual(os.stat(app.ENV_FILE).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(app.DEPLOYMENT_FILE).st_mode & 0o777, 0o600)
+
+    def test_resave_after_manual_edit_rewrites_file(self) -> None:
+        self.save()
+        saved = app.ENV_FILE.read_bytes()
+        app.ENV_FILE.write_bytes(saved + b"export EXTRA=manual\n")
+        self.save()
+        self.assertEqual(app.ENV_FILE.read_bytes(), saved)
+
+    def test_download_serves_manual_edits(self) -> None:
+        self.save()
+        self.assertEqual(self.client.get("/api/download-config").data, app.ENV_FILE.read_bytes())
+        edited = app.ENV_FILE.read_bytes() + b"export EXTRA=manual\n"
+        app.ENV_FILE.write_bytes(edited)
+        self.assertEqual(self.client.get("/api/download-config").data, edited)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,5 @@
+"""WSGI entrypoint for production servers, e.g. ``gunicorn -k gevent -w 1 wsgi:application``."""
+
+from app import app as application
+
+__all__ = ["application"]